@@ -21,7 +21,17 @@ Copyright (C) <2023> Jacques Michelet.
 -----------------------------------------------------------------------
 """
 
+import collections
+import concurrent.futures
+import dataclasses
+import functools
+import hashlib
+import json
+import operator
+import os
 import platform
+import re
+import threading
 import time
 import serial
 import serial.tools.list_ports
@@ -31,6 +41,24 @@ if platform.system() == 'Linux':
     import termios
 
 TIMEOUT_VALUE = 3
+VITESSES = (115200, 9600)    # Débits du lien série essayés successivement, du plus rapide au plus lent
+DELAI_SONDAGE = 0.5    # En secondes. Délai de réponse accordé lors de la recherche rapide du débit
+DELAI_PURGE = 0.05    # En secondes. Délai laissé à l'équipement pour rejeter une trame incomplète
+PERIODE_MOUVEMENT = 0.2    # En secondes. Période de rafraichissement lorsqu'une propriété est en cours de changement (BUSY)
+PERIODE_REPOS = 5    # En secondes. Période de rafraichissement lorsque toutes les propriétés sont stables
+DELAI_AFFICHAGE = 16    # En millisecondes. Regroupement des mises à jour des widgets, environ une par image affichée
+DELAI_ERREUR = 0.5    # En secondes. Une erreur identique à la précédente n'est pas réaffichée avant ce délai
+# Nombre maximal de messages USIS envoyés en rafale. Si l'équipement ne peut les mémoriser (tampon de réception
+# trop petit), la rafale échoue et les messages sont ensuite envoyés un à un (cf. ProtocoleUsis._echec_rafale)
+TAILLE_LOT = 16
+ATTRIBUTS_STATIQUES = ('MIN', 'MAX', 'PREC', 'UNIT')    # Attributs dont la valeur ne change pas, lue à la connexion
+# Erreurs fatales des échanges avec le spectroscope : lien série (serial.SerialException dérive d'OSError),
+# port fermé (AttributeError), réponse illisible ou mal formée (UnicodeDecodeError, IndexError)
+USIS_FATAL = (OSError, AttributeError, UnicodeDecodeError, IndexError)
+MOTIF_NOMBRE = re.compile(r'\s*[+-]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?\s*')    # Nombre décimal saisi
+MOTIF_TEXTE = re.compile(r'[ -)+-:<-~]*')    # Texte saisi : ASCII imprimable, hors séparateurs Usis ';' et '*'
+REPERTOIRE_CACHE = os.path.join(os.path.expanduser('~'), '.cache', 'wx_usis')    # Descriptions des équipements déjà rencontrés
+FICHIER_VITESSES = os.path.join(REPERTOIRE_CACHE, 'vitesses.json')    # Débit trouvé pour chaque convertisseur USB-série
 COULEUR_OK = wx.GREEN
 COULEUR_BUSY = wx.YELLOW
 COULEUR_ALERT = wx.RED
@@ -53,6 +81,9 @@ trad_en = {
     'action': 'Go',
     'arret': 'Stop',
     'etalonnage': 'Calibration',
+    'relecture': 'Refresh introspection',
+    'relecture_aide': 'Read the full description from the device instead of the saved one',
+    'saisie_incorrecte': 'Invalid value: a number is expected, or plain ASCII text without ";" or "*"',
 }
 
 trad_fr = {
@@ -73,6 +104,9 @@ trad_fr = {
     'action': 'Action',
     'arret': 'Arrêt',
     'etalonnage': 'Etalonnage',
+    'relecture': 'Relire la description',
+    'relecture_aide': 'Relire la description complète depuis l\'équipement plutôt que la copie conservée',
+    'saisie_incorrecte': 'Valeur incorrecte : un nombre est attendu, ou un texte ASCII simple sans ";" ni "*"',
 }
 
 trad = trad_en
@@ -96,6 +130,8 @@ class PortSerie:
     --------
     ajoute_callback
     Ajoute une fonction de callback qui sera appelée à chaque modification de l'attribut numero.
+    retire_callbacks
+    Retire toutes les fonctions de callback.
     '''
 
     def __init__(self, valeur_initiale=0):
@@ -112,7 +148,7 @@ class PortSerie:
         self._notify_observers(nouveau_numero)
 
     def _notify_observers(self, nouveau_numero):
-        for callback in self._callbacks:
+        for callback in tuple(self._callbacks):    # Une callback peut modifier la liste
             callback(nouveau_numero)
 
     def ajoute_callback(self, callback):
@@ -122,9 +158,16 @@ class PortSerie:
         Parameters:
         -----------
         callback : function pointer
-        Fonction à ajouter.
+        Fonction à ajouter. Une fonction déjà enregistrée ne l'est pas une seconde fois.
         '''
-        self._callbacks.append(callback)
+        if callback not in self._callbacks:
+            self._callbacks.append(callback)
+
+    def retire_callbacks(self):
+        '''
+        Retire toutes les fonctions callback enregistrées.
+        '''
+        self._callbacks.clear()
 
 
 # -------------------------------------------------------------------------------
@@ -218,6 +261,58 @@ class SelectionPortSerie(wx.Dialog):
 # -------------------------------------------------------------------------------
 
 
+@dataclasses.dataclass
+class DescriptionAttribut:
+    '''
+    Description d'un attribut d'une propriété Usis.
+
+    Attributs:
+    ----------
+    nom : string
+    Nom de l'attribut (VALUE, MIN, MAX, ...).
+    mode : string
+    Mode d'accès (RO ou RW).
+    valeurs : list of strings
+    Valeurs possibles pour une propriété de type ENUM, liste vide sinon.
+    valeur : string
+    Valeur de l'attribut pour les attributs de ATTRIBUTS_STATIQUES, None sinon.
+    Propre à l'équipement connecté : relue à chaque connexion, jamais conservée sur disque.
+    '''
+    __slots__ = ('nom', 'mode', 'valeurs', 'valeur')
+    nom: str
+    mode: str
+    valeurs: list
+    valeur: str
+
+
+@dataclasses.dataclass
+class DescriptionPropriete:
+    '''
+    Description d'une propriété Usis.
+
+    Attributs:
+    ----------
+    nom : string
+    Nom de la propriété.
+    type : string
+    Type de la propriété (FLOAT, ENUM, ...).
+    etat : string
+    Etat de la propriété lors de l'introspection.
+    attributs : dict of DescriptionAttribut
+    Attributs de la propriété indexés par leur nom, dans l'ordre fourni par l'équipement.
+    '''
+    __slots__ = ('nom', 'type', 'etat', 'attributs')
+    nom: str
+    type: str
+    etat: str
+    attributs: dict
+
+
+# -------------------------------------------------------------------------------
+# -------------------------------------------------------------------------------
+# -------------------------------------------------------------------------------
+
+
 class ProtocoleUsis():
     '''
     Gestion du dialogue avec un spectroscope compatible USIS.
@@ -225,7 +320,7 @@ class ProtocoleUsis():
 
     Attributs:
     ----------
-    description : list of lists.
+    description : list of DescriptionPropriete.
     Structure de description complète de l'équipement mise à jour par la fonction 'introspection'.
 
     Methods:
@@ -235,20 +330,159 @@ class ProtocoleUsis():
     et stocke les informations dans la structure 'description'.
     '''
 
-    def __init__(self, port):
+    def __init__(self, port, vitesse=None):
         '''
         Parameters:
         -----------
         port : string
         Nom du port série utilisé pour tous les échanges avec le spectroscope.
+        vitesse : int
+        Débit du lien série. Par défaut, le plus rapide des débits de VITESSES auquel l'équipement répond.
         '''
+        self._annule = False    # Plus aucun échange n'est accepté (cf. annulation)
+        self._rafales = True    # Faux si l'équipement ne supporte pas les envois en rafale (cf. _echec_rafale)
         try:
-            self._port_serie = serial.Serial(port=port, baudrate=9600, timeout=1, writeTimeout=1)
+            self._port_serie = serial.Serial(port=port, baudrate=vitesse or VITESSES[0], timeout=TIMEOUT_VALUE, writeTimeout=1)
         except serial.SerialException as se:
             self._port_serie = None
             raise se
+        self._mode_faible_latence()
+        time.sleep(0.1)    # Laisse arriver les éventuels octets parasites émis à l'ouverture du port ...
+        self._port_serie.reset_input_buffer()    # ... pour les éliminer avant le premier échange
+        try:
+            self.vitesse = vitesse or self._recherche_vitesse()    # Débit effectivement utilisé
+        except serial.SerialException as se:
+            self.fin()
+            raise se
 
         self.description = list()    # Structure de description complète de l'équipement après la phase d'introspection
+        self._trames = dict()    # Trames GET pré-formatées, indexées par (propriété, attribut)
+
+    def _mode_faible_latence(self):
+        '''
+        Réduit la latence des convertisseurs USB-série (FTDI, CP210x), qui sinon ne transmettent
+        les octets reçus que toutes les 16 ms, quel que soit le débit.
+        Tous les systèmes et pilotes ne le permettent pas : un échec n'est pas une erreur.
+        Sous Windows, le réglage se fait via la valeur 'LatencyTimer' du pilote FTDI (cf. Readme).
+        '''
+        try:
+            self._port_serie.set_low_latency_mode(True)
+            return
+        except (IOError, OSError, AttributeError, NotImplementedError, ValueError):
+            pass    # Pas de support de ASYNC_LOW_LATENCY par le pilote ou la plateforme
+
+        if platform.system() == 'Linux':
+            # Repli : réglage direct du timer de latence des convertisseurs usb-serial
+            chemin = os.path.join(
+                '/sys/bus/usb-serial/devices',
+                os.path.basename(os.path.realpath(self._port_serie.port)),
+                'latency_timer',
+            )
+            try:
+                with open(chemin, 'w') as fichier:
+                    fichier.write('1')
+            except (IOError, OSError):
+                pass    # Port natif, ou droits insuffisants
+
+    def _recherche_vitesse(self):
+        '''
+        Recherche le débit de l'équipement en l'interrogeant successivement à chacun des débits de VITESSES.
+        A un mauvais débit, l'équipement ne répond pas ou sa réponse est illisible.
+        Un premier passage rapide (délai DELAI_SONDAGE) est suivi si besoin d'un second avec le délai normal,
+        pour les équipements lents à répondre après l'ouverture du port.
+        Le débit trouvé est mémorisé pour le convertisseur USB-série utilisé, et essayé en premier la fois suivante.
+        '''
+        identite = self._identite_port()
+        memorisee = self._lecture_vitesse(identite)
+        essais = [(vitesse, DELAI_SONDAGE) for vitesse in VITESSES] + [(vitesse, TIMEOUT_VALUE) for vitesse in VITESSES]
+        if memorisee in VITESSES:
+            essais.insert(0, (memorisee, TIMEOUT_VALUE))
+
+        erreur = None
+        try:
+            for vitesse, delai in essais:
+                self._port_serie.baudrate = vitesse
+                self._port_serie.timeout = delai
+                try:
+                    self._purge_equipement()
+                    self.info_property_count()
+                except (serial.SerialException, RuntimeError, UnicodeDecodeError, IndexError, ValueError) as e:
+                    erreur = e
+                    self._resynchronisation()
+                    continue
+                if vitesse != memorisee:
+                    self._ecriture_vitesse(identite, vitesse)
+                return vitesse
+            raise serial.SerialException(str(erreur))
+        finally:
+            self._port_serie.timeout = TIMEOUT_VALUE
+
+    def _purge_equipement(self):
+        '''
+        Termine par une fin de ligne la trame éventuellement incomplète restée dans l'équipement
+        (octets illisibles reçus à un autre débit), puis élimine sa réponse.
+        '''
+        self._port_serie.write(b'\n')
+        time.sleep(DELAI_PURGE)
+        self._port_serie.reset_input_buffer()
+
+    def _identite_port(self):
+        '''
+        Identité du convertisseur USB-série du port utilisé, ou None si celui-ci
+        ne peut être identifié de façon sûre (port natif, convertisseur sans numéro de série).
+        '''
+        for info in serial.tools.list_ports.comports():
+            if info.device == self._port_serie.port and info.serial_number:
+                return '{0};{1};{2}'.format(info.vid, info.pid, info.serial_number)
+        return None
+
+    @staticmethod
+    def _lecture_vitesse(identite):
+        '''
+        Débit mémorisé pour le convertisseur 'identite', None si inconnu.
+        '''
+        if identite is None:
+            return None
+        try:
+            with open(FICHIER_VITESSES, 'r') as fichier:
+                return json.load(fichier).get(identite)
+        except (IOError, OSError, ValueError, AttributeError):
+            return None
+
+    @staticmethod
+    def _ecriture_vitesse(identite, vitesse):
+        '''
+        Mémorise le débit du convertisseur 'identite'. Un échec n'empêche pas de continuer.
+        '''
+        if identite is None:
+            return
+        try:
+            with open(FICHIER_VITESSES, 'r') as fichier:
+                vitesses = json.load(fichier)
+            if not isinstance(vitesses, dict):
+                vitesses = dict()
+        except (IOError, OSError, ValueError):
+            vitesses = dict()
+        vitesses[identite] = vitesse
+        try:
+            os.makedirs(REPERTOIRE_CACHE, exist_ok=True)
+            with open(FICHIER_VITESSES + '.tmp', 'w') as fichier:
+                json.dump(vitesses, fichier)
+            os.replace(FICHIER_VITESSES + '.tmp', FICHIER_VITESSES)
+        except (IOError, OSError):
+            pass
+
+    def annulation(self):
+        '''
+        Interrompt l'échange en cours et refuse les suivants, qui échouent aussitôt (erreur "ANNULATION").
+        Peut être appelée depuis un autre fil d'exécution que celui qui attend la réponse,
+        ce qui évite d'attendre l'expiration du délai de garde pour fermer le lien.
+        '''
+        self._annule = True
+        try:
+            self._port_serie.cancel_read()
+        except (AttributeError, serial.SerialException, OSError):
+            pass    # Interruption non supportée : l'échange en cours ira à son terme
 
     def fin(self):
         '''
@@ -257,57 +491,79 @@ class ProtocoleUsis():
         if self._port_serie:
             self._port_serie.close()
 
-    def _formattage_usis(self, str):
+    def _formattage_usis(self, message):
         '''
         Formatage d'une commande RS232 (ajout du checksum, majuscules) au format USIS.
+        Renvoie la trame prête à être envoyée.
         '''
-        str2 = str.strip('\n')
-        cs = hex(self._checksum(str2))[2:].zfill(2).upper()
-        return (str2 + '*' + cs + '\n')
+        corps = message.strip(b'\n')
+        return corps + b'*%02X\n' % self._checksum(corps)
 
-    def _checksum(self, str):
+    def _checksum(self, donnees):
         '''
-        Calcul du checksum d'une chaine de caractères.
+        Calcul du checksum (ou exclusif de tous les octets) d'une trame encodée.
         '''
-        cks = 0
-        for car in bytes(str, 'utf-8'):
-            cks = cks ^ car
-        return cks
+        return functools.reduce(operator.xor, donnees, 0)
 
-    def _ecriture_lecture(self, trame):
+    def _ecriture_lecture(self, trame, nb_reponses=1):
         '''
-        Ecriture et lecture de trames via le port série actif.
+        Ecriture et lecture de trames (bytes déjà formattés) via le port série actif.
+        'trame' peut regrouper plusieurs messages. Les 'nb_reponses' lignes reçues sont renvoyées dans l'ordre.
+        Le protocole étant strictement question-réponse, le tampon de réception est vide en temps normal :
+        il n'est nettoyé qu'après une erreur.
         '''
         try:
-            self._port_serie.reset_input_buffer()    # Nettoyage
-            self._port_serie.write(trame.encode('ascii'))    # Envoi du message
-            Reply_received = False
-            timeout_limit = time.time() + TIMEOUT_VALUE
-            timeout_reached = False
-            while not Reply_received and not timeout_reached:
-                try:
-                    if self._port_serie.in_waiting:
-                        ligne = str(self._port_serie.readline(), 'ascii')
-                        Reply_received = True
-                except Exception:
-                    time.sleep(3)    # Attente de 3 secondes avant une nouvelle tentative
-                timeout_reached = (time.time() >= timeout_limit)
-            if Reply_received:
-                return ligne    # Pas d'erreur
-            if timeout_reached:
-                raise serial.SerialException("TIMEOUT")
+            if self._annule:
+                raise serial.SerialException("ANNULATION")
+            self._port_serie.write(trame)    # Envoi du message
+            lignes = list()
+            for r in range(nb_reponses):
+                ligne = self._port_serie.read_until(b'\n')    # Bloquant, au plus TIMEOUT_VALUE secondes au total
+                if self._annule:
+                    raise serial.SerialException("ANNULATION")
+                if not ligne.endswith(b'\n'):    # Rien reçu, ou réponse tronquée
+                    self._resynchronisation()
+                    raise serial.SerialException("TIMEOUT")
+                lignes.append(str(ligne, 'ascii'))
+            return lignes    # Pas d'erreur
+        except UnicodeDecodeError as ude:
+            self._resynchronisation()
+            raise ude
         except serial.SerialException as se:
             raise se
         except termios.error as te:
             raise serial.SerialException(str(te))
 
+    def _resynchronisation(self):
+        '''
+        Après un échange en erreur, élimine les octets restés en attente (réponse tardive ou tronquée),
+        qui seraient sinon pris pour la réponse à la requête suivante.
+        '''
+        try:
+            self._port_serie.reset_input_buffer()
+        except (serial.SerialException, OSError):
+            pass    # L'erreur initiale sera signalée
+
+    def _decodage_usis(self, retour):
+        '''
+        Déformatte une réponse USIS et gère les erreurs si besoin.
+        '''
+        e = retour.rfind('*')
+        l_retour = retour[0:e].split(';')
+        if l_retour[0] == "M00":
+            return l_retour[-1], l_retour[-2]
+        elif l_retour[0][0] == 'C':
+            raise serial.SerialException(l_retour[1])
+        else:
+            raise RuntimeError(l_retour[1])
+
     def echange_usis(self, message):
         '''
         Formatte et envoie le message. Récupère et déformatte la réponse, et gère les erreurs si besoin.
 
         Parameters:
         -----------
-        message : string
+        message : bytes
         Message à envoyer.
 
         Returns:
@@ -322,91 +578,367 @@ class ProtocoleUsis():
         serial.SerialException
         En cas d'erreur de communication (fatale)
         '''
-        retour = self._ecriture_lecture(self._formattage_usis(message))
-        e = retour.rfind('*')
-        l_retour = retour[0:e].split(';')
-        if l_retour[0] == "M00":
-            return l_retour[-1], l_retour[-2]
-        elif l_retour[0][0] == 'C':
-            raise serial.SerialException(l_retour[1])
-        else:
-            raise RuntimeError(l_retour[1])
+        return self._echange_trame(self._formattage_usis(message))
+
+    def _echange_trame(self, trame):
+        '''
+        Comme echange_usis, pour une trame déjà formattée.
+        '''
+        return self._decodage_usis(self._ecriture_lecture(trame)[0])
+
+    def echange_usis_multiple(self, messages):
+        '''
+        Envoie les messages par lots de TAILLE_LOT, sans attendre les réponses intermédiaires,
+        puis récupère les réponses dans l'ordre d'envoi.
+        Toutes les réponses sont lues avant de signaler une éventuelle erreur,
+        de façon à laisser le lien série synchronisé.
+
+        Parameters:
+        -----------
+        messages : list of bytes
+        Messages à envoyer.
+
+        Returns:
+        -------
+        list of (string, string)
+        Etat et réponse pour chacun des messages.
+
+        Raises:
+        -------
+        Identiques à echange_usis.
+        '''
+        retours = self._echange_trames([self._formattage_usis(m) for m in messages])
+        return [self._decodage_usis(retour) for retour in retours]
+
+    def _echange_trames(self, trames):
+        '''
+        Envoie des trames déjà formattées par lots de TAILLE_LOT, et renvoie les réponses brutes dans l'ordre d'envoi.
+        '''
+        return self._echange_lots(self._regroupement(trames))
+
+    @staticmethod
+    def _regroupement(trames):
+        '''
+        Regroupe des trames formattées en lots de TAILLE_LOT : liste de (trames concaténées, nombre de trames).
+        '''
+        return [
+            (b''.join(trames[i:i + TAILLE_LOT]), len(trames[i:i + TAILLE_LOT]))
+            for i in range(0, len(trames), TAILLE_LOT)
+        ]
+
+    def _echange_lots(self, lots):
+        '''
+        Envoie des lots préparés par _regroupement, et renvoie les réponses brutes dans l'ordre d'envoi.
+        '''
+        retours = list()
+        for trame, nb_trames in lots:
+            retours.extend(self._ecriture_lecture(trame, nb_trames))
+        return retours
+
+    def _echec_rafale(self):
+        '''
+        Une rafale n'a pas abouti (réponse manquante ou illisible) : l'équipement ne peut sans doute pas
+        mémoriser autant de messages. Les échanges suivants se feront message par message,
+        sans payer à nouveau le délai de garde d'une rafale.
+        '''
+        self._rafales = False
+        self._resynchronisation()
 
     # -----------------------------------------------------------------------
     # Ensemble de fonctions permettant l'exploration des fonctionnalités
     # d'un équipement USIS (introspection)
+    @staticmethod
+    def _requete_info(cle, *indices):
+        '''
+        Construit un message 'INFO;<cle>[;<indice>...]'.
+        '''
+        return b'INFO;' + cle + b''.join([b';%d' % i for i in indices]) + b'\n'
+
     def info_property_count(self):
-        return int(self.echange_usis("INFO;PROPERTY_COUNT\n")[0])
+        return int(self.echange_usis(self._requete_info(b'PROPERTY_COUNT'))[0])
 
     def info_property_name(self, prop):
-        return self.echange_usis("INFO;PROPERTY_NAME;" + str(prop) + '\n')[0]
+        return self.echange_usis(self._requete_info(b'PROPERTY_NAME', prop))[0]
 
     def info_property_type(self, prop):
-        return self.echange_usis('INFO;PROPERTY_TYPE;' + str(prop) + '\n')[0]
+        return self.echange_usis(self._requete_info(b'PROPERTY_TYPE', prop))[0]
 
     def info_property_state(self, prop):
-        return self.echange_usis('INFO;PROPERTY_STATE;' + str(prop) + '\n')[0]
+        return self.echange_usis(self._requete_info(b'PROPERTY_STATE', prop))[0]
 
     def info_property_attr_count(self, prop):
-        return int(self.echange_usis('INFO;PROPERTY_ATTR_COUNT;' + str(prop) + '\n')[0])
+        return int(self.echange_usis(self._requete_info(b'PROPERTY_ATTR_COUNT', prop))[0])
 
     def info_property_attr_name(self, prop, attr):
-        return self.echange_usis('INFO;PROPERTY_ATTR_NAME;' + str(prop) + ';' + str(attr) + '\n')[0]
+        return self.echange_usis(self._requete_info(b'PROPERTY_ATTR_NAME', prop, attr))[0]
 
     def info_property_attr_mode(self, prop, attr):
-        return self.echange_usis('INFO;PROPERTY_ATTR_MODE;' + str(prop) + ';' + str(attr) + '\n')[0]
+        return self.echange_usis(self._requete_info(b'PROPERTY_ATTR_MODE', prop, attr))[0]
 
     def info_property_attr_enum_count(self, prop, attr):
-        return int(self.echange_usis('INFO;PROPERTY_ATTR_ENUM_COUNT;' + str(prop) + ';' + str(attr) + '\n')[0])
+        return int(self.echange_usis(self._requete_info(b'PROPERTY_ATTR_ENUM_COUNT', prop, attr))[0])
 
     def info_property_attr_enum_value(self, prop, enum):
-        return self.echange_usis('INFO;PROPERTY_ATTR_ENUM_VALUE;' + str(prop) + ';' + str(enum) + '\n')[0]
+        return self.echange_usis(self._requete_info(b'PROPERTY_ATTR_ENUM_VALUE', prop, enum))[0]
+
+    def _info_multiple(self, requetes):
+        '''
+        Envoie en rafale une liste de requêtes INFO, données sous la forme (cle, indices...),
+        et renvoie la liste des valeurs lues.
+        Si la rafale n'aboutit pas, les requêtes sont renvoyées une à une.
+        '''
+        messages = [self._requete_info(*requete) for requete in requetes]
+        if self._rafales:
+            try:
+                return [reponse[0] for reponse in self.echange_usis_multiple(messages)]
+            except (serial.SerialException, UnicodeDecodeError):
+                self._echec_rafale()
+        return [self.echange_usis(message)[0] for message in messages]
 
     # -----------------------------------------------------------------------
     # Ensemble de fonctions d'échanges avec l'équipement
+    def _formattage_get(self, prop, attr):
+        return self._formattage_usis(b'GET;%s;%s\n' % (prop.encode('ascii'), attr.encode('ascii')))
+
+    def _trame_get(self, prop, attr):
+        trame = self._trames.get((prop, attr))
+        if trame is None:
+            trame = self._formattage_get(prop, attr)
+        return trame
+
     def get(self, prop, attr):
-        return self.echange_usis('GET;' + str(prop) + ';' + str(attr) + '\n')
+        return self._echange_trame(self._trame_get(prop, attr))
+
+    def get_multiple(self, couples):
+        '''
+        Lecture en rafale de plusieurs attributs : toutes les requêtes sont envoyées d'un seul tenant,
+        puis les réponses sont lues dans l'ordre. Si la rafale n'aboutit pas (réponse manquante ou illisible),
+        les attributs sont relus un par un.
+
+        Parameters:
+        -----------
+        couples : list of (string, string)
+        Propriétés et attributs à lire.
+
+        Returns:
+        -------
+        list of (string, string)
+        Réponse et état pour chacun des couples.
+
+        Raises:
+        -------
+        Identiques à echange_usis.
+        '''
+        return self.get_preparee(self.preparation_lecture(couples))
+
+    def preparation_lecture(self, couples):
+        '''
+        Prépare une lecture en rafale destinée à être répétée (rafraichissement périodique) :
+        les trames GET sont formattées et regroupées en lots une fois pour toutes.
+
+        Parameters:
+        -----------
+        couples : list of (string, string)
+        Propriétés et attributs à lire.
+
+        Returns:
+        -------
+        (list of (string, string), list of (bytes, int))
+        Lecture préparée, à passer à get_preparee.
+        '''
+        couples = list(couples)
+        return couples, self._regroupement([self._trame_get(prop, attr) for prop, attr in couples])
+
+    def get_preparee(self, lecture):
+        '''
+        Comme get_multiple, pour une lecture préparée par preparation_lecture.
+        '''
+        couples, lots = lecture
+        if self._rafales:
+            try:
+                retours = self._echange_lots(lots)
+            except (serial.SerialException, UnicodeDecodeError):
+                self._echec_rafale()
+            else:
+                return [self._decodage_usis(retour) for retour in retours]
+        return [self.get(prop, attr) for prop, attr in couples]
 
     def set(self, prop, consigne):
-        return self.echange_usis('SET;' + prop + ';VALUE;' + str(consigne))
+        return self.echange_usis(b'SET;%s;VALUE;%s' % (prop.encode('ascii'), str(consigne).encode('ascii')))
 
     def stop(self, prop):
-        return self.echange_usis('STOP;' + prop)
+        return self.echange_usis(b'STOP;%s' % prop.encode('ascii'))
 
     def calib(self, prop, val_etalon):
-        return self.echange_usis('CALIB;' + prop + ';' + str(val_etalon))
+        return self.echange_usis(b'CALIB;%s;%s' % (prop.encode('ascii'), str(val_etalon).encode('ascii')))
 
     # -----------------------------------------------------------------------
 
-    def introspection(self):
+    def introspection(self, cache=True):
         '''
         Lit l'ensemble des propriétés et des attributs associés
-        et stocke les informations dans la structure self.description
+        et stocke les informations dans la structure self.description.
+        La description d'un équipement identifiable (numéro de série du convertisseur USB) est conservée
+        sur disque, et relue lors des connexions suivantes plutôt que redemandée à l'équipement,
+        après une vérification sommaire auprès de celui-ci (cf. _validation_cache).
+
+        Parameters:
+        -----------
+        cache : bool
+        False pour ignorer la description conservée sur disque et la redemander à l'équipement.
         '''
         nb_prop = self.info_property_count()
+        fichier_cache = self._fichier_cache(nb_prop)
+        description = None
+        if cache and fichier_cache:
+            description = self._lecture_cache(fichier_cache, nb_prop)
+            if description is not None and not self._validation_cache(description):
+                description = None    # Autre équipement sur le même convertisseur, ou micrologiciel mis à jour
+        if description is None:
+            description = self._introspection_equipement(nb_prop)
+            if fichier_cache:
+                self._ecriture_cache(fichier_cache, description)
+        self.description.extend(description)
+        self._preparation_trames()
+        self._lecture_statiques()
+
+    def _preparation_trames(self):
+        '''
+        Les lectures d'attributs (GET) sont toujours les mêmes une fois l'introspection faite :
+        leurs trames sont formattées une fois pour toutes.
+        '''
+        for desc_prop in self.description:
+            for nom_attr in desc_prop.attributs:
+                self._trames[(desc_prop.nom, nom_attr)] = self._formattage_get(desc_prop.nom, nom_attr)
+
+    def _introspection_equipement(self, nb_prop):
+        '''
+        Interroge l'équipement sur ses 'nb_prop' propriétés et renvoie leur description.
+        Les requêtes sont regroupées par niveau (propriétés, attributs, valeurs énumérées)
+        et envoyées en rafale pour limiter le nombre d'allers-retours sur le lien série.
+        '''
+        champs_prop = [b'PROPERTY_NAME', b'PROPERTY_TYPE', b'PROPERTY_STATE', b'PROPERTY_ATTR_COUNT']
+        reponses = self._info_multiple([(champ, p) for p in range(nb_prop) for champ in champs_prop])
+        descriptions = list()
+        nb_attrs = list()
         for p in range(nb_prop):
-            desc_prop = [
-                self.info_property_name(p),
-                self.info_property_type(p),
-                self.info_property_state(p),
-                self.info_property_attr_count(p),
-            ]
-            desc_attr = list()
-            for a in range(desc_prop[3]):
-                desc_attr.append([
-                    self.info_property_attr_name(p, a),
-                    self.info_property_attr_mode(p, a),
-                ])
-                if desc_prop[1] == "ENUM":
-                    desc_enum = list()
-                    nb_enum = self.info_property_attr_enum_count(p, a)
-                    desc_attr[a].append(nb_enum)
-                    for e in range(nb_enum):
-                        desc_enum.append(self.info_property_attr_enum_value(p, e))
-                    desc_attr[a].append(desc_enum)
-
-            desc_prop.append(desc_attr)
-            self.description.append(desc_prop)
+            nom, type_prop, etat, nb_attr = reponses[4 * p:4 * p + 4]
+            descriptions.append(DescriptionPropriete(nom, type_prop, etat, dict()))
+            nb_attrs.append(int(nb_attr))
+
+        # Noms et modes des attributs, ainsi que le nombre de valeurs possibles pour les propriétés de type ENUM
+        requetes = list()
+        for p, desc_prop in enumerate(descriptions):
+            for a in range(nb_attrs[p]):
+                requetes.append((b'PROPERTY_ATTR_NAME', p, a))
+                requetes.append((b'PROPERTY_ATTR_MODE', p, a))
+                if desc_prop.type == "ENUM":
+                    requetes.append((b'PROPERTY_ATTR_ENUM_COUNT', p, a))
+        reponses = iter(self._info_multiple(requetes))
+        nb_enums = list()
+        for p, desc_prop in enumerate(descriptions):
+            for a in range(nb_attrs[p]):
+                desc_attr = DescriptionAttribut(next(reponses), next(reponses), list(), None)
+                desc_prop.attributs[desc_attr.nom] = desc_attr
+                if desc_prop.type == "ENUM":
+                    nb_enums.append((p, desc_attr, int(next(reponses))))
+
+        # Valeurs possibles des attributs de type ENUM
+        requetes = list()
+        for p, desc_attr, nb_enum in nb_enums:
+            requetes.extend([(b'PROPERTY_ATTR_ENUM_VALUE', p, e) for e in range(nb_enum)])
+        reponses = iter(self._info_multiple(requetes))
+        for p, desc_attr, nb_enum in nb_enums:
+            desc_attr.valeurs.extend([next(reponses) for e in range(nb_enum)])
+
+        return descriptions
+
+    def _lecture_statiques(self):
+        '''
+        Lit en une seule rafale les valeurs des attributs statiques (bornes, précision, unité).
+        Ces valeurs étant propres à l'équipement, et non au convertisseur USB qui identifie le cache,
+        elles sont relues à chaque connexion.
+        '''
+        statiques = [
+            (desc_prop.nom, desc_attr) for desc_prop in self.description for desc_attr in desc_prop.attributs.values()
+            if desc_attr.nom in ATTRIBUTS_STATIQUES
+        ]
+        valeurs = self.get_multiple([(nom_prop, desc_attr.nom) for nom_prop, desc_attr in statiques])
+        for (nom_prop, desc_attr), (valeur, etat) in zip(statiques, valeurs):
+            desc_attr.valeur = valeur
+
+    def _fichier_cache(self, nb_prop):
+        '''
+        Chemin du fichier de cache propre à l'équipement connecté, ou None si celui-ci
+        ne peut être identifié de façon sûre (port natif, convertisseur sans numéro de série).
+        '''
+        identite = self._identite_port()
+        if identite is None:
+            return None
+        identite = '{0};{1}'.format(identite, nb_prop)
+        return os.path.join(REPERTOIRE_CACHE, hashlib.sha1(identite.encode('utf-8')).hexdigest() + '.json')
+
+    def _lecture_cache(self, fichier_cache, nb_prop):
+        '''
+        Relit une description conservée sur disque. None si absente ou inexploitable.
+        '''
+        try:
+            with open(fichier_cache, 'r') as fichier:
+                description = [
+                    DescriptionPropriete(
+                        desc_prop['nom'],
+                        desc_prop['type'],
+                        desc_prop['etat'],
+                        {nom: DescriptionAttribut(**desc_attr) for nom, desc_attr in desc_prop['attributs'].items()},
+                    ) for desc_prop in json.load(fichier)
+                ]
+        except (IOError, OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+        if len(description) != nb_prop:
+            return None
+        return description
+
+    def _validation_cache(self, description):
+        '''
+        Vérifie en une seule rafale qu'une description relue sur disque correspond toujours à l'équipement :
+        noms des propriétés, nombres d'attributs et nombres de valeurs possibles des attributs de type ENUM.
+
+        Returns:
+        -------
+        bool
+        Faux si l'équipement décrit par le cache n'est plus celui qui est connecté.
+        '''
+        verifications = list()    # (requête INFO, réponse attendue)
+        for p, desc_prop in enumerate(description):
+            verifications.append(((b'PROPERTY_NAME', p), desc_prop.nom))
+            verifications.append(((b'PROPERTY_ATTR_COUNT', p), len(desc_prop.attributs)))
+            if desc_prop.type == "ENUM":
+                for a, desc_attr in enumerate(desc_prop.attributs.values()):
+                    verifications.append(((b'PROPERTY_ATTR_ENUM_COUNT', p, a), len(desc_attr.valeurs)))
+        try:
+            reponses = self._info_multiple([requete for requete, attendue in verifications])
+            return all(
+                type(attendue)(reponse) == attendue for (requete, attendue), reponse in zip(verifications, reponses)
+            )
+        except (RuntimeError, ValueError):
+            return False    # Requête refusée (index inconnu de l'équipement) ou réponse inattendue
+
+    def _ecriture_cache(self, fichier_cache, description):
+        '''
+        Conserve une description sur disque. Un échec n'empêche pas de continuer.
+        Les valeurs des attributs statiques, propres à l'équipement, ne sont pas conservées.
+        '''
+        donnees = [dataclasses.asdict(desc_prop) for desc_prop in description]
+        for desc_prop in donnees:
+            for desc_attr in desc_prop['attributs'].values():
+                desc_attr['valeur'] = None
+        try:
+            os.makedirs(REPERTOIRE_CACHE, exist_ok=True)
+            with open(fichier_cache + '.tmp', 'w') as fichier:
+                json.dump(donnees, fichier)
+            os.replace(fichier_cache + '.tmp', fichier_cache)
+        except (IOError, OSError):
+            pass
 
     def lecture_complete(self):
         '''
@@ -414,16 +946,16 @@ class ProtocoleUsis():
         '''
         for desc_prop in self.description:
             print('\t {0} : type: {1} / etat: {2} / nb_attributs: {3}'.format(
-                desc_prop[0],
-                desc_prop[1],
-                desc_prop[2],
-                desc_prop[3],
+                desc_prop.nom,
+                desc_prop.type,
+                desc_prop.etat,
+                len(desc_prop.attributs),
             ))
-            for desc_attr in desc_prop[4]:
-                valeur_attribut = self.get(desc_prop[0], desc_attr[0])[0]
-                print('\t\t {0} : {1} ({2})'.format(desc_attr[0], valeur_attribut, desc_attr[1]))
-                if desc_prop[1] == 'ENUM':
-                    print('\t\t\t Valeurs possibles: {0}'.format(desc_attr[3]))
+            for desc_attr in desc_prop.attributs.values():
+                valeur_attribut = self.get(desc_prop.nom, desc_attr.nom)[0]
+                print('\t\t {0} : {1} ({2})'.format(desc_attr.nom, valeur_attribut, desc_attr.mode))
+                if desc_prop.type == 'ENUM':
+                    print('\t\t\t Valeurs possibles: {0}'.format(desc_attr.valeurs))
 
 
 # -------------------------------------------------------------------------------
@@ -431,6 +963,64 @@ class ProtocoleUsis():
 # -------------------------------------------------------------------------------
 
 
+@functools.lru_cache(maxsize=None)
+def formattage_texte(texte):
+    '''
+    Formatte un texte de type "AA_BBBB" en "Aa bbbb".
+    Les noms de propriétés étant en nombre fini, le résultat est mémorisé.
+    '''
+    t1 = texte.replace("_", " ")
+    return t1[0].upper() + t1[1:].lower()
+
+
+class LigneIhm:
+    '''
+    Références aux widgets non statiques de la ligne d'une propriété Usis.
+    Les widgets absents de la ligne valent None.
+
+    Attributs:
+    ----------
+    nom : string
+    Nom de la propriété, conservé pour éviter de le rechercher dans la description à chaque appui.
+    valeur : wx.StaticText
+    Affichage de la valeur courante.
+    consigne : wx.TextCtrl ou wx.ComboBox
+    Saisie de la valeur de consigne.
+    lecture_consigne : fonction
+    Renvoie la consigne saisie, convertie selon le type de la propriété.
+    action : wx.Button
+    Bouton d'action.
+    arret : wx.Button
+    Bouton d'arrêt.
+    val_etalon : wx.TextCtrl
+    Saisie de la valeur d'étalonnage.
+    lecture_etalon : fonction
+    Renvoie la valeur d'étalonnage saisie, convertie selon le type de la propriété.
+    etalon : wx.Button
+    Bouton d'étalonnage.
+    '''
+    __slots__ = (
+        'nom', 'valeur', 'consigne', 'lecture_consigne', 'action', 'arret', 'val_etalon', 'lecture_etalon', 'etalon'
+    )
+
+    def __init__(self, nom):
+        for attribut in self.__slots__:
+            setattr(self, attribut, None)
+        self.nom = nom
+
+
+class SecuriteLigne:
+    '''
+    Drapeaux de sécurité de la ligne d'une propriété Usis.
+    True => la valeur de consigne (action) ou d'étalonnage (etalon) doit être remise à la valeur courante.
+    '''
+    __slots__ = ('action', 'etalon')
+
+    def __init__(self):
+        self.action = False
+        self.etalon = False
+
+
 class IHM_Usis(wx.Frame):
     '''
     Gestion graphique d'un spectroscope via le protocole Usis.
@@ -441,13 +1031,23 @@ class IHM_Usis(wx.Frame):
         Mise en place de l'interface graphique
         '''
         super().__init__(None, title=wx.GetApp().GetAppName())
-        self._ihm = dict()    # Références aux objets WxPython non statiques.
+        self._ihm = list()    # Références aux objets WxPython non statiques, indexées par l'id de la ligne.
         '''
         Drapeaux permettant de metre les valeurs de consigne et d'étalonnage des propriétés à la valeur courante.
         Ce qui permet de minimiser les erreurs lors d'appuis accidentels sur les boutons d'action ou d'étalonnage.
         True => mise à jour requise.
         '''
-        self._securite = dict()
+        self._securite = list()
+        self._dernier_etat = dict()    # Dernier couple (valeur, etat) affiché pour chaque propriété
+        self._maj_en_attente = dict()    # Dernier couple (valeur, etat) lu et pas encore affiché, pour chaque propriété
+        self._maj_programmee = False    # Vrai si l'application des mises à jour en attente est déjà programmée
+        self._verrou_maj = threading.Lock()    # Protège les deux attributs précédents
+        self._en_cours = set()    # Commandes (id, bouton) en cours de traitement, pour ignorer les appuis répétés
+        self._derniere_erreur = (None, None, 0.0)    # (id, message, instant) de la dernière erreur Usis affichée
+        self._erreurs_en_attente = collections.deque()    # Couples (id, message) des erreurs Usis pas encore affichées
+        self._affichage_erreurs_programme = False    # Vrai si l'affichage des erreurs en attente est déjà programmé
+        self._plan_rafraichissement = list()    # (id, nom) des propriétés dont la valeur est affichée
+        self._lecture_rafraichissement = None    # Lecture en rafale de ces valeurs, préparée par le protocole Usis
 
         # Vilaine verrue pour les commandes STOP et CALIB
         self._fonctions_motorisees = ['GRATING_ANGLE', 'GRATING_WAVELENGTH', 'FOCUS_POSITION']
@@ -457,10 +1057,19 @@ class IHM_Usis(wx.Frame):
 
         self._usis = None    # Instance gérant le protocole Usis
 
-        self._chrono = wx.Timer(self, wx.ID_ANY)    # Chrono permettant la mise à jour périodique du graphique
+        # Fil d'exécution chargé de la mise à jour périodique du graphique, pour ne pas bloquer l'interface
+        self._fil_rafraichissement = None
+        self._arret_rafraichissement = threading.Event()
+        self._fermeture_en_cours = False    # Fenêtre en cours de fermeture, à distinguer de l'arrêt du rafraichissement
+        self._reveil = threading.Event()    # Déclenche un rafraichissement sans attendre la fin de la période
+        self._en_pause = False    # Pas de rafraichissement tant que la fenêtre est réduite
+        self._verrou = threading.Lock()    # Accès exclusif au lien série, partagé entre les fils d'exécution
+        # Fil d'exécution des commandes (action, arrêt, étalonnage), traitées une à une sans bloquer l'interface
+        self._executeur = concurrent.futures.ThreadPoolExecutor(max_workers=1)
 
         # Id qui vont permettre de gérer les items des menus
         self._id_serie = wx.NewIdRef()
+        self._id_relecture = wx.NewIdRef()
         self._id_sortie = wx.NewIdRef()
 
         self._init_ihm()
@@ -480,6 +1089,7 @@ class IHM_Usis(wx.Frame):
         # Menu Préférences
         self._menu_connexion = wx.Menu()
         self._menu_connexion.Append(self._id_serie, trad['port_serie'], trad['port_rs232'])
+        self._menu_connexion.AppendCheckItem(self._id_relecture, trad['relecture'], trad['relecture_aide'])
         menuBar.Append(self._menu_connexion, trad['connexion'])
         # Assignation
         self.SetMenuBar(menuBar)
@@ -492,16 +1102,39 @@ class IHM_Usis(wx.Frame):
 
         self.Bind(wx.EVT_MENU, self._sortie, id=self._id_sortie)
         self.Bind(wx.EVT_MENU, self._selection_port_serie, id=self._id_serie)
+        self.Bind(wx.EVT_ICONIZE, self._reduction)
+        self.Bind(wx.EVT_CLOSE, self._fermeture)
 
     def _sortie(self, evt):
         '''
         Callback déclenché par le menu Fichier->Sortie.
         '''
-        if self._usis:
-            # Fermeture du port série
-            self._usis.fin()
         self.Close()
 
+    def _fermeture(self, evt):
+        '''
+        Callback déclenché par la fermeture de la fenêtre, via le menu ou le gestionnaire de fenêtres.
+        '''
+        self._fermeture_en_cours = True
+        self._port_choisi.retire_callbacks()
+        self._fin_rafraichissement()
+        self._executeur.shutdown(wait=False)
+        if self._usis:
+            # Fermeture du port série, sans attendre l'expiration d'un éventuel échange en cours
+            self._usis.annulation()
+            with self._verrou:
+                self._usis.fin()
+        evt.Skip()
+
+    def _reduction(self, evt):
+        '''
+        Callback déclenché par la réduction ou la restauration de la fenêtre.
+        '''
+        self._en_pause = evt.IsIconized()
+        if not self._en_pause:
+            self._reveil.set()
+        evt.Skip()
+
     def _selection_port_serie(self, evt):
         '''
         Callback déclenchés par le menu Connexion->Port série.
@@ -525,7 +1158,7 @@ class IHM_Usis(wx.Frame):
         '''
         try:
             self._usis = ProtocoleUsis(self._ports_serie[numero][0])
-            self._usis.introspection()
+            self._usis.introspection(cache=not self._menu_connexion.IsChecked(self._id_relecture))
             # print(self._usis.description)
             # self._usis.lecture_complete()
             self._tableau_de_bord()
@@ -546,7 +1179,17 @@ class IHM_Usis(wx.Frame):
         grille = wx.FlexGridSizer(rows=len(self._usis.description) + 1, cols=11, vgap=3, hgap=10)
 
         # Construction de la grille à partir de la description Usis
-        self._construction_grille(panneau, grille)
+        panneau.Freeze()    # Pas de mise à jour graphique widget par widget pendant la construction
+        try:
+            self._construction_grille(panneau, grille)
+        finally:
+            panneau.Thaw()
+        self._plan_rafraichissement = [
+            (id, ligne.nom) for id, ligne in enumerate(self._ihm) if ligne.valeur is not None
+        ]
+        self._lecture_rafraichissement = self._usis.preparation_lecture(
+            [(nom_prop, 'VALUE') for id, nom_prop in self._plan_rafraichissement]
+        )
 
         # Placement de la grille dans le panneau
         panneau.SetSizer(grille)
@@ -559,13 +1202,14 @@ class IHM_Usis(wx.Frame):
         boite.Fit(self)
         boite.SetSizeHints(self)
 
-        # Active le rafraichissement toutes les secondes
-        self.Bind(wx.EVT_TIMER, self._rafraichissement)
-        self._chrono.Start(1000)
+        # Active le rafraichissement périodique
+        self._fil_rafraichissement = threading.Thread(target=self._rafraichissement, daemon=True)
+        self._fil_rafraichissement.start()
 
     def _construction_grille(self, panneau, grille):
         '''
         Construction de la grille des propriétés à partir de la description fournies par le protocole Usis.
+        Les cellules vides de la grille sont de simples espaces, sans widget.
         '''
         for t in [
                 trad['nom'],
@@ -580,7 +1224,10 @@ class IHM_Usis(wx.Frame):
                 trad['precision'],
                 trad['unite'],
         ]:
-            grille.Add(wx.StaticText(panneau, wx.ID_ANY, t), 0, wx.ALIGN_CENTER_HORIZONTAL, 0)
+            if t:
+                grille.Add(wx.StaticText(panneau, wx.ID_ANY, t), 0, wx.ALIGN_CENTER_HORIZONTAL, 0)
+            else:
+                grille.AddSpacer(0)
 
         for id in range(len(self._usis.description)):
             # Les widgets susceptibles de changement vont recevoir un id égal à l'indice de la propriété
@@ -590,9 +1237,9 @@ class IHM_Usis(wx.Frame):
             except RuntimeError as rte:
                 self._boite_erreur(str(rte), fatal=True)
 
-            self._ihm[id] = dict()    # Pour pouvoir gérer les évènements ultérieurs
-            self._securite[id] = dict()
-            etiq_nom = wx.StaticText(panneau, wx.ID_ANY, self.formattage_texte(desc_prop[0]))
+            self._ihm.append(LigneIhm(desc_prop.nom))    # Pour pouvoir gérer les évènements ultérieurs, à l'indice id
+            self._securite.append(SecuriteLigne())
+            etiq_nom = wx.StaticText(panneau, wx.ID_ANY, self.formattage_texte(desc_prop.nom))
 
             etiq_valeur, \
                 edit_valeur, \
@@ -611,272 +1258,462 @@ class IHM_Usis(wx.Frame):
             etiq_unite = self._affichage_auxiliaire(panneau, id, 'UNIT')
 
             grille.Add(etiq_nom, 0, wx.ALL | wx.ALIGN_LEFT, 5)
-            grille.Add(etiq_valeur, 0, wx.ALL | wx.ALIGN_RIGHT, 1)
-            grille.Add(edit_valeur)
-            grille.Add(bouton_commande)
-            grille.Add(bouton_arret)
-            grille.Add(edit_etalon)
-            grille.Add(bouton_etalon)
-            grille.Add(etiq_min, 0, wx.ALL | wx.ALIGN_RIGHT, 5)
-            grille.Add(etiq_max, 0, wx.ALL | wx.ALIGN_RIGHT, 5)
-            grille.Add(etiq_prec, 0, wx.ALL | wx.ALIGN_RIGHT, 5)
-            grille.Add(etiq_unite, 0, wx.ALL | wx.ALIGN_RIGHT, 5)
+            self._ajout_cellule(grille, etiq_valeur, 0, wx.ALL | wx.ALIGN_RIGHT, 1)
+            self._ajout_cellule(grille, edit_valeur)
+            self._ajout_cellule(grille, bouton_commande)
+            self._ajout_cellule(grille, bouton_arret)
+            self._ajout_cellule(grille, edit_etalon)
+            self._ajout_cellule(grille, bouton_etalon)
+            self._ajout_cellule(grille, etiq_min, 0, wx.ALL | wx.ALIGN_RIGHT, 5)
+            self._ajout_cellule(grille, etiq_max, 0, wx.ALL | wx.ALIGN_RIGHT, 5)
+            self._ajout_cellule(grille, etiq_prec, 0, wx.ALL | wx.ALIGN_RIGHT, 5)
+            self._ajout_cellule(grille, etiq_unite, 0, wx.ALL | wx.ALIGN_RIGHT, 5)
+
+    @staticmethod
+    def _ajout_cellule(grille, widget, *args):
+        '''
+        Ajoute un widget à la grille, ou une cellule vide si 'widget' vaut None.
+        '''
+        if widget is None:
+            grille.AddSpacer(0)
+        else:
+            grille.Add(widget, *args)
 
     def _construction_ligne(self, panneau, id, desc_prop):
         '''
         Construction de la ligne dans 'panneau' des valeurs et boutons pour une propriété
-        donnée par 'id' et 'desc_prop'.
+        donnée par 'id' et 'desc_prop'. Les cellules vides sont renvoyées à None.
         '''
         global trad
 
         attribut_valeur = self._recherche_attribut(id, 'VALUE')
         if attribut_valeur:
             try:
-                valeur = self._usis.get(desc_prop[0], 'VALUE')[0]
+                valeur = self._usis.get(desc_prop.nom, 'VALUE')[0]
             except RuntimeError as rte:
                 self._boite_erreur(str(rte), fatal=True)
 
             etiq_valeur = wx.StaticText(panneau, id, str(valeur))
-            self._ihm[id]['valeur'] = etiq_valeur
-            if attribut_valeur[1] == 'RW':
-                if desc_prop[1] == 'ENUM':
+            self._ihm[id].valeur = etiq_valeur
+            if attribut_valeur.mode == 'RW':
+                if desc_prop.type == 'ENUM':
                     edit_valeur = wx.ComboBox(
                         panneau,
                         id,
-                        choices=attribut_valeur[3],
+                        choices=attribut_valeur.valeurs,
                         style=wx.CB_DROPDOWN | wx.ALIGN_RIGHT,
                     )
-                    edit_valeur.SetSelection(attribut_valeur[3].index(valeur))
+                    edit_valeur.SetSelection(attribut_valeur.valeurs.index(valeur))
 
                 else:
                     edit_valeur = wx.TextCtrl(panneau, id, str(valeur), style=wx.ALIGN_RIGHT)
 
                 # Mise en place des boutons d'actions
-                self._ihm[id]['consigne'] = edit_valeur
+                self._ihm[id].consigne = edit_valeur
+                self._ihm[id].lecture_consigne = self._lecteur_saisie(edit_valeur, desc_prop, attribut_valeur)
                 bouton_commande = wx.Button(panneau, id, trad['action'])
-                self._ihm[id]['action'] = bouton_commande
-                self._securite[id]['action'] = False
+                self._ihm[id].action = bouton_commande
+                self._securite[id].action = False
 
                 # Certaines propriétés sont relatives à des moteurs.
                 # Ce qui n'est pas explicite dans la spec. Usis. D'où la verrue poilue ...
-                if desc_prop[0] in self._fonctions_motorisees:
+                if desc_prop.nom in self._fonctions_motorisees:
                     # Oh, la vilaine verrue !
                     bouton_arret = wx.Button(panneau, id, trad['arret'])
-                    self._ihm[id]['arret'] = bouton_arret
+                    self._ihm[id].arret = bouton_arret
                     edit_etalon = wx.TextCtrl(panneau, id, str(valeur), style=wx.ALIGN_RIGHT)
-                    self._ihm[id]['val_etalon'] = edit_etalon
+                    self._ihm[id].val_etalon = edit_etalon
+                    self._ihm[id].lecture_etalon = self._lecteur_saisie(edit_etalon, desc_prop, attribut_valeur)
                     bouton_etalon = wx.Button(panneau, id, trad['etalonnage'])
-                    self._ihm[id]['etalon'] = bouton_etalon
-                    self._securite[id]['etalon'] = False
+                    self._ihm[id].etalon = bouton_etalon
+                    self._securite[id].etalon = False
                 else:
-                    bouton_arret = wx.StaticText(panneau, wx.ID_ANY, '')
-                    edit_etalon = wx.StaticText(panneau, wx.ID_ANY, '')
-                    bouton_etalon = wx.StaticText(panneau, wx.ID_ANY, '')
+                    bouton_arret = None
+                    edit_etalon = None
+                    bouton_etalon = None
                     # Fin de la verrue
 
-            else:    # if attribut_valeur[1] == 'RW':
+            else:    # if attribut_valeur.mode == 'RW':
                 # Valeur en lecture seule, donc pas de boutons et de saisie de valeur de consigne ou d'étalonnage
-                edit_valeur = wx.StaticText(panneau, wx.ID_ANY, '')
-                bouton_commande = wx.StaticText(panneau, wx.ID_ANY, '')
-                bouton_arret = wx.StaticText(panneau, wx.ID_ANY, '')
-                edit_etalon = wx.StaticText(panneau, wx.ID_ANY, '')
-                bouton_etalon = wx.StaticText(panneau, wx.ID_ANY, '')
+                edit_valeur = None
+                bouton_commande = None
+                bouton_arret = None
+                edit_etalon = None
+                bouton_etalon = None
 
         else:    # if attribut_valeur:
-            etiq_valeur = wx.StaticText(panneau, wx.ID_ANY, '')
-            edit_valeur = wx.StaticText(panneau, wx.ID_ANY, '')
-            bouton_commande = wx.StaticText(panneau, wx.ID_ANY, '')
-            bouton_arret = wx.StaticText(panneau, wx.ID_ANY, '')
-            edit_etalon = wx.StaticText(panneau, wx.ID_ANY, '')
-            bouton_etalon = wx.StaticText(panneau, wx.ID_ANY, '')
+            etiq_valeur = None
+            edit_valeur = None
+            bouton_commande = None
+            bouton_arret = None
+            edit_etalon = None
+            bouton_etalon = None
 
         return (etiq_valeur, edit_valeur, bouton_commande, bouton_arret, edit_etalon, bouton_etalon)
 
+    @staticmethod
+    def _lecteur_saisie(widget, desc_prop, attribut_valeur):
+        '''
+        Renvoie la fonction qui lit la valeur saisie dans 'widget', convertie selon le type de la propriété.
+        Le choix est fait une fois pour toutes lors de la construction de la ligne, et non à chaque appui.
+        La fonction renvoie None si la saisie ne peut être envoyée : aucun choix sélectionné, texte qui n'est pas
+        un nombre pour une propriété de type FLOAT, ou qui ne tient pas dans une trame Usis sinon.
+        La vérification a ainsi lieu dans le fil principal, avant l'envoi de la commande.
+        '''
+        if isinstance(widget, wx.ComboBox):
+            choix = tuple(attribut_valeur.valeurs)    # Copie propre au widget, indexée directement par la sélection
+
+            def lecture_choix():
+                selection = widget.GetSelection()
+                return choix[selection] if selection >= 0 else None
+
+            return lecture_choix
+
+        lecture = widget.GetValue    # Méthode liée une fois pour toutes
+        if desc_prop.type == 'FLOAT':
+            def lecture_nombre():
+                texte = lecture()
+                return float(texte) if MOTIF_NOMBRE.fullmatch(texte) else None
+
+            return lecture_nombre
+        else:
+            def lecture_texte():
+                texte = lecture()
+                return texte if MOTIF_TEXTE.fullmatch(texte) else None
+
+            return lecture_texte
+
     # Fonctions de rafraichissement périodique des valeurs
     # ----------------------------------------------------
-    def _rafraichissement(self, evt):
+    def _rafraichissement(self):
         '''
         Met à jour les informations susceptibles de changer.
-        Callback appelé par le _timer.
+        Boucle du fil de rafraichissement : les échanges avec le spectroscope s'y font sans bloquer l'interface,
+        les widgets étant mis à jour dans le fil principal via wx.CallAfter.
+        La période est courte tant qu'une propriété est en cours de changement, longue sinon.
+        Une commande envoyée au spectroscope provoque un rafraichissement immédiat (_reveil).
         '''
-        for id in self._ihm.keys():
-            nom_prop = self._usis.description[id][0]
+        periode = PERIODE_MOUVEMENT
+        while True:
+            self._reveil.wait(periode)
+            self._reveil.clear()
+            if self._arret_rafraichissement.is_set():
+                return
+            if self._en_pause:
+                periode = None    # Attente de la restauration de la fenêtre
+                continue
+
+            occupe = False
             try:
-                valeur, etat = self._usis.get(nom_prop, 'VALUE')
+                for id, valeur, etat in self._lecture_valeurs():
+                    occupe = occupe or etat == 'BUSY'
+                    self._mise_en_attente(id, valeur, etat)
             except RuntimeError as rte:
-                self._boite_erreur(str(rte))
-                break
-            except Exception as e:
-                self._boite_erreur(str(e), fatal=True)
-                break
+                wx.CallAfter(self._erreur_usis, None, rte)
+            except USIS_FATAL as e:
+                if not self._arret_rafraichissement.is_set():    # Sinon, échange interrompu par la fermeture
+                    wx.CallAfter(self._boite_erreur, str(e), fatal=True)
+                return
+
+            periode = PERIODE_MOUVEMENT if occupe else PERIODE_REPOS
+
+    def _fin_rafraichissement(self):
+        '''
+        Arrêt définitif du fil de rafraichissement.
+        '''
+        self._arret_rafraichissement.set()
+        self._reveil.set()
 
-            self._maj_valeurs(id, valeur, etat)
-            self._maj_action(id, valeur, etat)
-            self._maj_etalon(id, valeur, etat)
+    def _lecture_valeurs(self):
+        '''
+        Lit en une seule rafale les valeurs de toutes les propriétés affichées.
+        Si l'une d'elles est en erreur, les valeurs sont relues une à une jusqu'à la propriété fautive,
+        de sorte que les précédentes soient tout de même mises à jour.
+        Générateur de triplets (id, valeur, etat).
+        '''
+        plan = self._plan_rafraichissement
+        try:
+            with self._verrou:
+                if self._arret_rafraichissement.is_set():
+                    return
+                resultats = self._usis.get_preparee(self._lecture_rafraichissement)
+        except RuntimeError:
+            for id, nom_prop in plan:
+                with self._verrou:
+                    if self._arret_rafraichissement.is_set():
+                        return
+                    valeur, etat = self._usis.get(nom_prop, 'VALUE')
+                yield id, valeur, etat
+            return
+
+        for (id, nom_prop), (valeur, etat) in zip(plan, resultats):
+            yield id, valeur, etat
+
+    def _mise_en_attente(self, id, valeur, etat):
+        '''
+        Met en attente une valeur lue par le fil de rafraichissement.
+        Seule la dernière valeur lue de chaque propriété est conservée, et les valeurs en attente
+        sont appliquées ensemble, au plus une fois toutes les DELAI_AFFICHAGE millisecondes.
+        '''
+        with self._verrou_maj:
+            self._maj_en_attente[id] = (valeur, etat)
+            if self._maj_programmee:
+                return
+            self._maj_programmee = True
+        wx.CallAfter(wx.CallLater, DELAI_AFFICHAGE, self._application_maj_en_attente)
+
+    def _application_maj_en_attente(self):
+        '''
+        Report dans les widgets de toutes les valeurs en attente, sans redessin intermédiaire.
+        '''
+        with self._verrou_maj:
+            en_attente = self._maj_en_attente
+            self._maj_en_attente = dict()
+            self._maj_programmee = False
+        if self._arret_rafraichissement.is_set():
+            return    # Fenêtre en cours de fermeture
+        self.Freeze()
+        try:
+            for id, (valeur, etat) in en_attente.items():
+                self._application_maj(id, valeur, etat)
+        finally:
+            self.Thaw()
 
-        self.Refresh()
+    def _application_maj(self, id, valeur, etat):
+        '''
+        Report dans les widgets d'une valeur lue par le fil de rafraichissement.
+        '''
+        if self._dernier_etat.get(id) == (valeur, etat):
+            return    # Rien n'a changé, inutile de redessiner
+        self._dernier_etat[id] = (valeur, etat)
+        self._maj_valeurs(id, valeur, etat)
+        self._maj_action(id, valeur, etat)
+        self._maj_etalon(id, valeur, etat)
 
     def _maj_valeurs(self, id, valeur, etat):
         # Zone des valeurs des propriétés
-        self._ihm[id]['valeur'].SetLabel(valeur)
+        etiq_valeur = self._ihm[id].valeur
+        etiq_valeur.SetLabel(valeur)
         if etat == 'OK':
-            self._ihm[id]['valeur'].SetForegroundColour(COULEUR_OK)
+            etiq_valeur.SetForegroundColour(COULEUR_OK)
         elif etat == 'BUSY':
-            self._ihm[id]['valeur'].SetForegroundColour(COULEUR_BUSY)
+            etiq_valeur.SetForegroundColour(COULEUR_BUSY)
         else:
-            self._ihm[id]['valeur'].SetForegroundColour(COULEUR_ALERT)
+            etiq_valeur.SetForegroundColour(COULEUR_ALERT)
 
     def _maj_action(self, id, valeur, etat):
         # Zone des boutons d'action
-        if 'action' in self._ihm[id].keys():
+        ligne = self._ihm[id]
+        if ligne.action is not None:
+            securite = self._securite[id]
             if etat == 'OK':
-                self._ihm[id]['action'].Enable()
-                if self._securite[id]['action']:
-                    self._ihm[id]['consigne'].SetValue(valeur)
-                    self._securite[id]['action'] = False
+                ligne.action.Enable()
+                if securite.action:
+                    ligne.consigne.SetValue(valeur)
+                    securite.action = False
 
             else:
-                self._ihm[id]['action'].Disable()
-                self._securite[id]['action'] = True
-                self._securite[id]['etalon'] = True
+                ligne.action.Disable()
+                securite.action = True
+                securite.etalon = True
 
     def _maj_etalon(self, id, valeur, etat):
         # Zone des boutons d'étalonnage
-        if 'etalon' in self._ihm[id].keys():
+        ligne = self._ihm[id]
+        if ligne.etalon is not None:
+            securite = self._securite[id]
             if etat == 'OK':
-                self._ihm[id]['etalon'].Enable()
-                if self._securite[id]['etalon']:
-                    self._ihm[id]['val_etalon'].SetValue(valeur)
-                    self._securite[id]['etalon'] = False
+                ligne.etalon.Enable()
+                if securite.etalon:
+                    ligne.val_etalon.SetValue(valeur)
+                    securite.etalon = False
             else:
-                self._ihm[id]['etalon'].Disable()
-                self._securite[id]['etalon'] = True
-                self._securite[id]['action'] = True
+                ligne.etalon.Disable()
+                securite.etalon = True
+                securite.action = True
 
     def _boite_erreur(self, texte, fatal=False):
         '''
         Boite de dialogue d'erreur. 'fatal' désactive le rafraichissement automatique.
         '''
         if fatal:
-            self._chrono.Stop()
+            self._fin_rafraichissement()
         dlg = wx.MessageDialog(self, texte, 'Erreur', wx.OK)
         dlg.ShowModal()
         dlg.Destroy()
 
+    def _erreur_usis(self, id, rte):
+        '''
+        Signale une erreur non fatale renvoyée par le spectroscope (RuntimeError).
+        L'erreur est mise en attente, et toutes les erreurs en attente sont affichées ensemble par _affichage_erreurs.
+        Une erreur identique à la précédente n'est pas réaffichée moins de DELAI_ERREUR secondes
+        après la fermeture de sa boite de dialogue : un équipement bloqué renvoie la même erreur en boucle.
+        '''
+        message = rte.args[0] if rte.args else ''
+        if message == self._derniere_erreur[1] and time.monotonic() - self._derniere_erreur[2] < DELAI_ERREUR:
+            return
+        if any(message == m for _, m in self._erreurs_en_attente):
+            return    # Déjà en attente d'affichage
+        self._erreurs_en_attente.append((id, message))
+        if not self._affichage_erreurs_programme:
+            self._affichage_erreurs_programme = True
+            wx.CallAfter(self._affichage_erreurs)
+
+    def _affichage_erreurs(self):
+        '''
+        Affiche en une seule boite de dialogue toutes les erreurs non fatales en attente.
+        Les erreurs signalées pendant l'affichage sont regroupées dans la boite suivante,
+        plutôt que d'ouvrir une boite par erreur.
+        '''
+        while self._erreurs_en_attente and not self._fermeture_en_cours:
+            erreurs = list(self._erreurs_en_attente)
+            self._erreurs_en_attente.clear()
+            self._boite_erreur('\n'.join(message for id, message in erreurs))
+            self._derniere_erreur = erreurs[-1] + (time.monotonic(), )
+        self._affichage_erreurs_programme = False
+
     def _recherche_attribut(self, id, attribut):
         '''
         Recherche un attribut dans la liste des attributs de la propriété référencée par 'id'.
         '''
-        for desc_attr in self._usis.description[id][4]:
-            if desc_attr[0] == attribut:
-                return desc_attr
-
-        return None
+        return self._usis.description[id].attributs.get(attribut)
 
     def _affichage_auxiliaire(self, panneau, id, attribut):
         '''
         Ajout de texte décrivant la valeur d'un attribut du propriété 'id'.
+        La valeur a été lue lors de l'introspection. None si la propriété n'a pas cet attribut.
         '''
         desc_attr = self._recherche_attribut(id, attribut)
         if desc_attr:
-            val = self._usis.get(self._usis.description[id][0], attribut)[0]
+            val = desc_attr.valeur
             try:
                 val2 = float(val)
             except ValueError:
                 val2 = val.lower()
             return wx.StaticText(panneau, wx.ID_ANY, str(val2))
         else:
-            return wx.StaticText(panneau, wx.ID_ANY, "")
+            return None
 
     # Gestion des évènements, cad de l'appui sur les boutons
     # ------------------------------------------------------
     def _affectation_evenements(self):
         '''
         Tous les boutons d'une même famille (action, arrêt ou étalonnage)ont le même callback.
-        Le tri sera fait dans les callbacks.
+        L'id de la ligne est lié au callback lors de l'affectation, plutôt que retrouvé à chaque appui.
+        '''
+        for id, ligne in enumerate(self._ihm):
+            if ligne.action is not None:
+                ligne.action.Bind(wx.EVT_BUTTON, functools.partial(self._action, id=id))
+            if ligne.arret is not None:
+                ligne.arret.Bind(wx.EVT_BUTTON, functools.partial(self._arret, id=id))
+            if ligne.etalon is not None:
+                ligne.etalon.Bind(wx.EVT_BUTTON, functools.partial(self._etalon, id=id))
+
+    def _action(self, evt, id):
         '''
-        for id in self._ihm.keys():
-            if 'action' in self._ihm[id].keys():
-                self._ihm[id]['action'].Bind(wx.EVT_BUTTON, self._action)
-            if 'arret' in self._ihm[id].keys():
-                self._ihm[id]['arret'].Bind(wx.EVT_BUTTON, self._arret)
-            if 'etalon' in self._ihm[id].keys():
-                self._ihm[id]['etalon'].Bind(wx.EVT_BUTTON, self._etalon)
+        Boutons d'actions. 'id' est celui de la ligne du bouton appuyé.
+        '''
+        self._traitement_bouton(id, 'action', self._usis.set, self._ihm[id].lecture_consigne)
 
-    def _action(self, evt):
+    def _arret(self, evt, id):
         '''
-        Boutons d'actions.
+        Boutons d'arrêt. 'id' est celui de la ligne du bouton appuyé.
         '''
-        # Identification du bouton appuyé et de la propriété qui lui correspond
-        id = evt.GetEventObject().GetId()
-        nom_prop = self._usis.description[id][0]
-        try:
-            # Lecture de la valeur de consigne
-            if self._ihm[id]['consigne'].__class__.__name__ == 'TextCtrl':
-                consigne = self._ihm[id]['consigne'].GetValue()
-                if self._usis.description[id][1] == 'FLOAT':
-                    consigne = float(consigne)
-
-            elif self._ihm[id]['consigne'].__class__.__name__ == 'ComboBox':
-                i = self._ihm[id]['consigne'].GetSelection()
-                consigne = self._usis.description[id][4][0][3][i]
-
-            # Action
-            self._securite[id]['action'] = True
-            self._ihm[id]['action'].Disable()
-            valeur, etat = self._usis.set(nom_prop, consigne)
-        except RuntimeError as rte:
-            self._boite_erreur(str(rte))
-            self._ihm[id]['action'].Enable()
-        except Exception as e:
-            self._boite_erreur(str(e), fatal=True)
-            self._sortie(None)
+        self._traitement_bouton(id, 'arret', self._usis.stop)
 
-    def _arret(self, evt):
+    def _etalon(self, evt, id):
         '''
-        Boutons d'arrêt.
+        Boutons d'étalonnage. 'id' est celui de la ligne du bouton appuyé.
         '''
-        # Identification du bouton appuyé
-        id = evt.GetEventObject().GetId()
-        nom_prop = self._usis.description[id][0]
-        try:
-            # Arret
-            valeur, etat = self._usis.stop(nom_prop)
-        except RuntimeError as rte:
-            self._boite_erreur(str(rte))
-            self._ihm[id]['arret'].Enable()
-        except Exception as e:
-            self._boite_erreur(str(e), fatal=True)
-            self._sortie(None)
+        self._traitement_bouton(id, 'etalon', self._usis.calib, self._ihm[id].lecture_etalon)
+
+    def _traitement_bouton(self, id, bouton, fonction, lecture=None):
+        '''
+        Traitement commun des boutons d'action, d'arrêt et d'étalonnage.
+
+        Parameters:
+        -----------
+        id : int
+        Id de la ligne du bouton appuyé.
+        bouton : string
+        Nom du bouton dans la ligne ('action', 'arret' ou 'etalon').
+        fonction : fonction
+        Commande Usis à exécuter, appelée avec le nom de la propriété et, le cas échéant, la valeur saisie.
+        lecture : fonction
+        Lecture de la valeur saisie (consigne ou étalonnage), None si la commande n'en utilise pas.
+        La lecture renvoie elle-même None si la saisie est incorrecte.
+        '''
+        en_cours = self._en_cours
+        cle = (id, bouton)
+        if cle in en_cours:
+            return    # Appui répété avant la fin du traitement du précédent
+        en_cours.add(cle)
+        # Identification de la propriété qui correspond au bouton appuyé
+        ligne = self._ihm[id]
+        args = (ligne.nom, )
+        if lecture is not None:
+            valeur = lecture()
+            if valeur is None:
+                en_cours.discard(cle)
+                self._boite_erreur(trad['saisie_incorrecte'])
+                return
+            args += (valeur, )
+
+        if bouton == 'action':
+            # La consigne sera remise à la valeur courante à la fin de l'action
+            self._securite[id].action = True
+            # Les appuis répétés étant déjà ignorés (_en_cours), le bouton peut être grisé avec le prochain redessin
+            wx.CallAfter(ligne.action.Disable)
+        self._commande(id, bouton, fonction, *args)
+
+    def _commande(self, id, bouton, fonction, *args):
+        '''
+        Exécute la commande Usis 'fonction(*args)' dans le fil d'exécution des commandes.
+        Son résultat est traité dans le fil principal par _fin_commande.
+        '''
+        futur = self._executeur.submit(self._execution_commande, fonction, *args)
+        futur.add_done_callback(functools.partial(wx.CallAfter, self._fin_commande, id, bouton))
+
+    def _execution_commande(self, fonction, *args):
+        '''
+        Corps d'une commande, dans le fil d'exécution des commandes.
+        '''
+        with self._verrou:
+            return fonction(*args)
 
-    def _etalon(self, evt):
+    def _fin_commande(self, id, bouton, futur):
         '''
-        Boutons d'étalonnage.
+        Traitement du résultat d'une commande, dans le fil principal.
         '''
-        # Identification du bouton appuyé
-        id = evt.GetEventObject().GetId()
-        nom_prop = self._usis.description[id][0]
         try:
-            # Lecture de la valeur de consigne
-            consigne = self._ihm[id]['val_etalon'].GetValue()
-            if self._usis.description[id][1] == 'FLOAT':
-                val_etalon = float(consigne)
-            # Etalonnage
-            valeur, etat = self._usis.calib(nom_prop, val_etalon)
+            if self._fermeture_en_cours:
+                return
+            # Commande terminée, en succès ou non : la prochaine lecture doit être reportée, même inchangée
+            self._dernier_etat.pop(id, None)
+            with self._verrou_maj:
+                self._maj_en_attente.pop(id, None)    # Lecture antérieure à la commande, périmée
+            valeur, etat = futur.result()
+            if self._arret_rafraichissement.is_set():
+                # Plus de lecture pour réactiver le bouton (rafraichissement arrêté sur une erreur fatale)
+                wx.CallAfter(getattr(self._ihm[id], bouton).Enable)
+            self._reveil.set()
         except RuntimeError as rte:
-            self._boite_erreur(str(rte))
-            self._ihm[id]['etalon'].Enable()
-        except Exception as e:
+            self._erreur_usis(id, rte)
+            wx.CallAfter(getattr(self._ihm[id], bouton).Enable)
+            self._reveil.set()
+        except USIS_FATAL as e:
             self._boite_erreur(str(e), fatal=True)
             self._sortie(None)
+        finally:
+            self._en_cours.discard((id, bouton))
 
     @staticmethod
     def formattage_texte(texte):
         '''
         Formatte un texte de type "AA_BBBB" en "Aa bbbb".
+        Conservée pour compatibilité, voir la fonction formattage_texte du module.
         '''
-        t1 = texte.replace("_", " ")
-        return t1[0].upper() + t1[1:].lower()
+        return formattage_texte(texte)
 
 
 # -------------------------------------------------------------------------------